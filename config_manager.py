@@ -61,12 +61,19 @@ class ConfigManager:
         "ai.model": "local",
         "ai.temperature": 0.7,
         "ai.max_tokens": 2048,
+        "ai.prompt_cache_size": 128,
+        "ai.analysis_cache_size": 64,
         
         # Automation settings
         "automation.auto_build": False,
         "automation.auto_test": True,
         "automation.auto_deploy": False,
         
+        # Workflow settings
+        "workflow.cache_ttl": 3600,
+        "workflow.step_cache_max": 256,
+        "workflow.run_history_max": 1000,
+        
         # Logging settings
         "logging.level": "INFO",
         "logging.file_enabled": True,
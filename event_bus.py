@@ -6,6 +6,7 @@ Enables loose coupling between modules while maintaining deterministic behavior.
 """
 
 import threading
+from contextlib import contextmanager
 from typing import Dict, List, Callable, Any, Optional
 from collections import defaultdict
 from dataclasses import dataclass
@@ -147,6 +148,27 @@ class EventBus:
         else:
             self._dispatch_event(event)
     
+    @contextmanager
+    def span(self, event_prefix: str, *args, source: str = None):
+        """
+        Emit a started/completed event pair around a block.
+        
+        Emits ``<event_prefix>_started`` with *args on entry and
+        ``<event_prefix>_completed`` on exit. Values the block appends to
+        the yielded list are passed to the completed event after *args.
+        
+        Args:
+            event_prefix: Event name prefix
+            *args: Positional arguments for both events
+            source: Optional source identifier
+        """
+        self.emit(f"{event_prefix}_started", *args, source=source)
+        outcome = []
+        try:
+            yield outcome
+        finally:
+            self.emit(f"{event_prefix}_completed", *args, *outcome, source=source)
+    
     def _dispatch_event(self, event: Event):
         """Dispatch event to all matching subscribers."""
         with self._lock:
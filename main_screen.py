@@ -4,7 +4,11 @@ DroidForge Main Screen
 Primary application screen with navigation and content areas.
 """
 
+from collections import defaultdict, deque
+from pathlib import Path
+
 from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
 from kivy.uix.scrollview import ScrollView
 from kivy.properties import ObjectProperty, StringProperty, ListProperty
 from kivy.clock import Clock
@@ -32,178 +36,32 @@ from kivymd.uix.snackbar import MDSnackbar, MDSnackbarText
 
 from utils.logger import get_logger
 
-# KV Language definition for complex layouts
-KV = '''
-#:import NoTransition kivy.uix.screenmanager.NoTransition
+# KV Language rules for complex layouts. Builder tracks loaded files by
+# name, so checking Builder.files keeps a module reload from re-parsing them.
+KV_FILE = str(Path(__file__).parent / "main_screen.kv")
 
-<DrawerClickableItem@MDNavigationDrawerItem>
-    focus_color: "#e7e4c0"
-    text_color: "#4a4939"
-    icon_color: "#4a4939"
-    ripple_color: "#c5bdd2"
-    selected_color: "#0c6c4d"
+if KV_FILE not in Builder.files:
+    Builder.load_file(KV_FILE)
 
-<DrawerLabelItem@MDNavigationDrawerItem>
-    text_color: "#4a4939"
-    icon_color: "#4a4939"
-    focus_behavior: False
-    selected_color: "#4a4939"
-    _no_ripple_effect: True
+# Lines kept in the console transcript; older lines are dropped
+MAX_CONSOLE_LINES = 500
 
-<ConsoleScreen>:
-    MDBoxLayout:
-        orientation: 'vertical'
-        padding: dp(10)
-        spacing: dp(10)
-        
-        # Output area
-        MDCard:
-            id: output_card
-            orientation: 'vertical'
-            padding: dp(10)
-            size_hint_y: 0.7
-            md_bg_color: 0.08, 0.08, 0.1, 1
-            radius: [dp(10)]
-            
-            ScrollView:
-                id: output_scroll
-                do_scroll_x: False
-                
-                MDLabel:
-                    id: console_output
-                    text: "DroidForge Console v1.0.0\\n[color=00ff00]Ready for commands...[/color]\\n"
-                    markup: True
-                    font_name: "RobotoMono"
-                    font_size: sp(12)
-                    size_hint_y: None
-                    height: self.texture_size[1]
-                    text_size: self.width, None
-                    padding: dp(5), dp(5)
-        
-        # Input area
-        MDCard:
-            orientation: 'horizontal'
-            padding: dp(5)
-            size_hint_y: None
-            height: dp(56)
-            md_bg_color: 0.1, 0.1, 0.12, 1
-            radius: [dp(10)]
-            
-            MDTextField:
-                id: command_input
-                hint_text: "Enter command..."
-                mode: "rectangle"
-                size_hint_x: 0.85
-                on_text_validate: root.execute_command()
-            
-            MDIconButton:
-                icon: "send"
-                on_release: root.execute_command()
+# Console line colors (RGBA), applied per row instead of via markup
+CONSOLE_COLORS = {
+    "output": (1, 1, 1, 1),
+    "command": (0, 1, 1, 1),
+    "success": (0, 1, 0, 1),
+    "warning": (1, 1, 0, 1),
+    "error": (1, 0, 0, 1),
+}
 
-<DashboardScreen>:
-    MDBoxLayout:
-        orientation: 'vertical'
-        padding: dp(10)
-        spacing: dp(10)
-        
-        ScrollView:
-            MDBoxLayout:
-                orientation: 'vertical'
-                spacing: dp(10)
-                size_hint_y: None
-                height: self.minimum_height
-                padding: dp(5)
-                
-                # Status Card
-                MDCard:
-                    orientation: 'vertical'
-                    padding: dp(15)
-                    size_hint_y: None
-                    height: dp(150)
-                    md_bg_color: 0.1, 0.2, 0.15, 1
-                    radius: [dp(15)]
-                    
-                    MDLabel:
-                        text: "System Status"
-                        font_style: "H6"
-                        size_hint_y: None
-                        height: dp(30)
-                    
-                    MDLabel:
-                        id: status_label
-                        text: "Engine: [color=00ff00]Running[/color]"
-                        markup: True
-                    
-                    MDLabel:
-                        id: queue_label
-                        text: "Queue: 0 commands"
-                
-                # Quick Actions Card
-                MDCard:
-                    orientation: 'vertical'
-                    padding: dp(15)
-                    size_hint_y: None
-                    height: dp(180)
-                    radius: [dp(15)]
-                    
-                    MDLabel:
-                        text: "Quick Actions"
-                        font_style: "H6"
-                        size_hint_y: None
-                        height: dp(30)
-                    
-                    MDBoxLayout:
-                        spacing: dp(10)
-                        size_hint_y: None
-                        height: dp(50)
-                        
-                        MDRaisedButton:
-                            text: "Build APK"
-                            on_release: root.trigger_build()
-                        
-                        MDRaisedButton:
-                            text: "Run Tests"
-                            on_release: root.trigger_tests()
-                    
-                    MDBoxLayout:
-                        spacing: dp(10)
-                        size_hint_y: None
-                        height: dp(50)
-                        
-                        MDRaisedButton:
-                            text: "Git Status"
-                            on_release: root.git_status()
-                        
-                        MDRaisedButton:
-                            text: "AI Generate"
-                            on_release: root.ai_generate()
 
-<ConfigScreen>:
-    MDBoxLayout:
-        orientation: 'vertical'
-        padding: dp(10)
-        
-        ScrollView:
-            MDList:
-                id: config_list
+class ConsoleLineLabel(Label):
+    """Plain console row; color comes from the row data, markup is off."""
 
-<HistoryScreen>:
-    MDBoxLayout:
-        orientation: 'vertical'
-        padding: dp(10)
-        
-        MDTopAppBar:
-            title: "Execution History"
-            size_hint_y: None
-            height: dp(56)
-            right_action_items: [["delete", lambda x: root.clear_history()]]
-        
-        ScrollView:
-            MDList:
-                id: history_list
-'''
 
-Builder.load_string(KV)
+class ConsoleMarkupLineLabel(ConsoleLineLabel):
+    """Console row for the rare lines that need multi-color markup."""
 
 
 class ConsoleScreen(MDScreen):
@@ -215,6 +73,18 @@ class ConsoleScreen(MDScreen):
         self.logger = get_logger("ConsoleScreen")
         self.command_history = []
         self.history_index = -1
+        
+        # Console rows, bounded and rendered at most once per frame
+        self._lines = deque(maxlen=MAX_CONSOLE_LINES)
+        self._render_trigger = Clock.create_trigger(self._render_output)
+        self._scroll_trigger = Clock.create_trigger(self._scroll_to_bottom)
+        
+        # Collapse runs of identical lines (heartbeats, polling ticks)
+        self._last_line = None
+        self._repeat_count = 0
+        
+        self.append_output("DroidForge Console v1.0.0")
+        self.append_output("Ready for commands...", color="success")
     
     def on_enter(self):
         """Called when screen is displayed."""
@@ -235,7 +105,7 @@ class ConsoleScreen(MDScreen):
         self.history_index = len(self.command_history)
         
         # Display command
-        self.append_output(f"[color=00ffff]> {command}[/color]")
+        self.append_output(f"> {command}", color="command")
         
         # Clear input
         command_input.text = ""
@@ -247,9 +117,9 @@ class ConsoleScreen(MDScreen):
             if parsed.is_valid:
                 self.engine.execute(parsed.command, parsed.params, async_exec=False)
             else:
-                self.append_output(f"[color=ff0000]Error: {parsed.error}[/color]")
+                self.append_output(f"Error: {parsed.error}", color="error")
         else:
-            self.append_output("[color=ffff00]Engine not available[/color]")
+            self.append_output("Engine not available", color="warning")
     
     def on_command_result(self, exec_id, result):
         """Handle command completion."""
@@ -261,20 +131,42 @@ class ConsoleScreen(MDScreen):
     
     def on_command_error(self, exec_id, error):
         """Handle command error."""
-        self.append_output(f"[color=ff0000]Error: {error}[/color]")
+        self.append_output(f"Error: {error}", color="error")
     
-    def append_output(self, text):
-        """Append text to console output."""
-        output_label = self.ids.console_output
-        output_label.text += f"\n{text}"
-        
-        # Scroll to bottom
-        Clock.schedule_once(lambda dt: self._scroll_to_bottom(), 0.1)
+    def append_output(self, text, color="output", markup=False):
+        """
+        Append a line to console output.
+        
+        Args:
+            text: Line to display
+            color: Key into CONSOLE_COLORS for the whole line
+            markup: Render text as Kivy markup (for multi-color lines)
+        """
+        line = (text, color, markup)
+        
+        if line == self._last_line:
+            # Rewrite the previous line as "line ×N" instead of adding a row
+            self._repeat_count += 1
+            self._lines[-1]["text"] = f"{text} ×{self._repeat_count}"
+        else:
+            self._last_line = line
+            self._repeat_count = 1
+            self._lines.append({
+                "text": text,
+                "color": CONSOLE_COLORS[color],
+                "viewclass": "ConsoleMarkupLineLabel" if markup else "ConsoleLineLabel",
+            })
+        
+        self._render_trigger()
+        self._scroll_trigger()
+    
+    def _render_output(self, dt):
+        """Render the buffered rows into the console view."""
+        self.ids.console_output.data = list(self._lines)
     
-    def _scroll_to_bottom(self):
+    def _scroll_to_bottom(self, dt):
         """Scroll console to bottom."""
-        scroll = self.ids.output_scroll
-        scroll.scroll_y = 0
+        self.ids.console_output.scroll_y = 0
 
 
 class DashboardScreen(MDScreen):
@@ -348,12 +240,9 @@ class ConfigScreen(MDScreen):
         config = self.config_manager.export_config()
         
         # Group by prefix
-        groups = {}
+        groups = defaultdict(list)
         for key, value in sorted(config.items()):
-            prefix = key.split('.')[0]
-            if prefix not in groups:
-                groups[prefix] = []
-            groups[prefix].append((key, value))
+            groups[key.split('.', 1)[0]].append((key, value))
         
         for group_name, items in groups.items():
             # Group header
@@ -394,11 +283,16 @@ class HistoryScreen(MDScreen):
         history = self.engine.get_history(limit=50)
         
         for record in reversed(history):
-            status_icon = "check-circle" if record.get("status") == "completed" else "alert-circle"
-            status_color = "00ff00" if record.get("status") == "completed" else "ff0000"
+            completed = record.get("status") == "completed"
+            status_icon = "check-circle" if completed else "alert-circle"
+            status_color = CONSOLE_COLORS["success" if completed else "error"]
             
             item = OneLineIconListItem(
-                IconLeftWidget(icon=status_icon),
+                IconLeftWidget(
+                    icon=status_icon,
+                    theme_text_color="Custom",
+                    text_color=status_color
+                ),
                 text=f"[{record.get('id', 'N/A')}] {record.get('command', 'Unknown')}"
             )
             history_list.add_widget(item)
@@ -520,9 +414,7 @@ class MainScreen(MDBoxLayout):
     
     def _refresh(self):
         """Refresh current screen."""
-        current = self.screen_manager.current_screen
-        if hasattr(current, 'on_enter'):
-            current.on_enter()
+        self.screen_manager.current_screen.on_enter()
     
     def _show_menu(self):
         """Show options menu."""
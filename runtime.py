@@ -7,10 +7,13 @@ Implements a modular, local-first AI system.
 
 import re
 import json
+import threading
+import time
 from typing import Dict, List, Optional, Any, Callable
+from collections import OrderedDict
 from dataclasses import dataclass
+from functools import lru_cache
 from enum import Enum
-from datetime import datetime
 
 from utils.logger import get_logger
 from .code_generator import CodeGenerator, Language
@@ -26,7 +29,13 @@ class TaskType(Enum):
     FIX = "fix"
 
 
-@dataclass
+# Dense member positions for tuple-indexed handler dispatch
+for _position, _member in enumerate(TaskType):
+    _member._index = _position
+del _position, _member
+
+
+@dataclass(slots=True)
 class AITask:
     """Represents an AI task."""
     task_type: TaskType
@@ -43,7 +52,7 @@ class AITask:
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AIResponse:
     """Response from AI processing."""
     success: bool
@@ -53,229 +62,109 @@ class AIResponse:
     metadata: Dict[str, Any] = None
 
 
-class AIRuntime:
+# Regex sources for intent detection. Only their fused alternation is
+# compiled, and only once a runtime first needs it.
+_PATTERNS: Dict[str, str] = {
+    "create_class": r"(?:create|generate|make)\s+(?:a\s+)?(?:new\s+)?class\s+(?:called\s+)?(\w+)",
+    "create_function": r"(?:create|generate|make)\s+(?:a\s+)?(?:new\s+)?function\s+(?:called\s+)?(\w+)",
+    "create_screen": r"(?:create|generate|make)\s+(?:a\s+)?(?:new\s+)?screen\s+(?:called\s+|for\s+)?(\w+)",
+    "explain": r"(?:explain|describe|what\s+(?:is|does))\s+(.+)",
+    "refactor": r"(?:refactor|improve|optimize|clean\s+up)\s+(.+)",
+    "fix": r"(?:fix|debug|solve|repair)\s+(.+)",
+}
+
+
+# Fused pattern -> {intent name: index of its first capture group, or None}
+_TARGET_GROUPS: Dict[re.Pattern, Dict[str, Optional[int]]] = {}
+
+
+def _fuse_patterns(patterns: Dict[str, str]) -> re.Pattern:
     """
-    AI Runtime for DroidForge.
-    
-    This is a standalone AI system that provides:
-    - Code generation based on prompts
-    - Code analysis and explanation
-    - Refactoring suggestions
-    - Pattern-based code completion
+    Fuse intent patterns into one alternation so a prompt is scanned once.
     
-    Note: This is an independent implementation, not using
-    any third-party AI services or proprietary APIs.
+    Each pattern becomes a named group; when several intents appear in
+    one prompt, the one that starts earliest wins. The fused index of each
+    intent's first capture group is recorded in _TARGET_GROUPS.
     """
+    fused = re.compile(
+        "|".join(f"(?P<{name}>{pattern})" for name, pattern in patterns.items()),
+        re.IGNORECASE | re.ASCII
+    )
+    
+    target_groups: Dict[str, Optional[int]] = {}
+    for name, pattern in patterns.items():
+        index = fused.groupindex[name]
+        target_groups[name] = index + 1 if re.compile(pattern).groups else None
+    _TARGET_GROUPS[fused] = target_groups
+    
+    return fused
+
+
+@lru_cache(maxsize=None)
+def _default_intent_pattern() -> re.Pattern:
+    """Compile the built-in intent alternation on first use."""
+    return _fuse_patterns(_PATTERNS)
+
+
+# Keywords that select a free-form generation template
+_KEYWORD_RE = re.compile(r"api|endpoint|test|config")
+
+# Common error types and the fix reported for each, in report order
+_ERROR_FIXES = {
+    "IndentationError": "Fixed indentation",
+    "NameError": "Check for undefined variables or missing imports",
+    "SyntaxError": "Check for missing colons, brackets, or quotes",
+}
+_ERROR_RE = re.compile("|".join(_ERROR_FIXES))
+
+
+def _hash_context(context: Optional[Dict]) -> Optional[frozenset]:
+    """Build a cache key for a prompt context, or None if it is unhashable."""
+    if not context:
+        return frozenset()
+    try:
+        key = frozenset(context.items())
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+@lru_cache(maxsize=256)
+def _detect_intent_cached(intent_pattern: re.Pattern,
+                          prompt: str) -> tuple[TaskType, tuple[tuple[str, str], ...]]:
+    """
+    Match a prompt against a fused intent pattern.
     
-    def __init__(self, config_manager, event_bus):
-        self.config = config_manager
-        self.event_bus = event_bus
-        self.logger = get_logger("AIRuntime")
-        
-        # Initialize components
-        self.code_generator = CodeGenerator(config_manager)
-        
-        # Task handlers
-        self._handlers: Dict[TaskType, Callable] = {
-            TaskType.GENERATE: self._handle_generate,
-            TaskType.REFACTOR: self._handle_refactor,
-            TaskType.EXPLAIN: self._handle_explain,
-            TaskType.ANALYZE: self._handle_analyze,
-            TaskType.COMPLETE: self._handle_complete,
-            TaskType.FIX: self._handle_fix,
-        }
-        
-        # Pattern matchers for intent detection
-        self._patterns = self._compile_patterns()
-        
-        self.logger.info("AI Runtime initialized")
-    
-    def _compile_patterns(self) -> Dict[str, re.Pattern]:
-        """Compile regex patterns for intent detection."""
-        return {
-            "create_class": re.compile(
-                r"(?:create|generate|make)\s+(?:a\s+)?(?:new\s+)?class\s+(?:called\s+)?(\w+)",
-                re.IGNORECASE
-            ),
-            "create_function": re.compile(
-                r"(?:create|generate|make)\s+(?:a\s+)?(?:new\s+)?function\s+(?:called\s+)?(\w+)",
-                re.IGNORECASE
-            ),
-            "create_screen": re.compile(
-                r"(?:create|generate|make)\s+(?:a\s+)?(?:new\s+)?screen\s+(?:called\s+|for\s+)?(\w+)",
-                re.IGNORECASE
-            ),
-            "explain": re.compile(
-                r"(?:explain|describe|what\s+(?:is|does))\s+(.+)",
-                re.IGNORECASE
-            ),
-            "refactor": re.compile(
-                r"(?:refactor|improve|optimize|clean\s+up)\s+(.+)",
-                re.IGNORECASE
-            ),
-            "fix": re.compile(
-                r"(?:fix|debug|solve|repair)\s+(.+)",
-                re.IGNORECASE
-            ),
-        }
-    
-    def process(self, task: AITask) -> AIResponse:
-        """
-        Process an AI task.
-        
-        Args:
-            task: AITask to process
-            
-        Returns:
-            AIResponse with results
-        """
-        start_time = datetime.now()
-        
-        self.logger.info(f"Processing AI task: {task.task_type.value}")
-        self.event_bus.emit("ai_task_started", task.task_type.value)
-        
-        handler = self._handlers.get(task.task_type)
-        if not handler:
-            return AIResponse(
-                success=False,
-                result={"error": f"Unknown task type: {task.task_type}"},
-                task_type=task.task_type,
-                processing_time_ms=0
-            )
-        
-        try:
-            result = handler(task)
-            success = True
-        except Exception as e:
-            self.logger.error(f"AI task failed: {e}")
-            result = {"error": str(e)}
-            success = False
-        
-        elapsed_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-        
-        response = AIResponse(
-            success=success,
-            result=result,
-            task_type=task.task_type,
-            processing_time_ms=elapsed_ms
-        )
-        
-        self.event_bus.emit("ai_task_completed", task.task_type.value, success)
-        
-        return response
-    
-    def process_prompt(self, prompt: str, context: Dict = None) -> AIResponse:
-        """
-        Process a natural language prompt.
-        
-        Args:
-            prompt: Natural language instruction
-            context: Additional context
-            
-        Returns:
-            AIResponse with results
-        """
-        # Detect intent from prompt
-        task_type, extracted_data = self._detect_intent(prompt)
-        
-        task = AITask(
-            task_type=task_type,
-            prompt=prompt,
-            context={**(context or {}), **extracted_data}
-        )
-        
-        return self.process(task)
-    
-    def _detect_intent(self, prompt: str) -> tuple[TaskType, Dict]:
-        """Detect intent from natural language prompt."""
-        extracted = {}
-        
-        # Check patterns
-        for pattern_name, pattern in self._patterns.items():
-            match = pattern.search(prompt)
-            if match:
-                extracted["match"] = match.group(1) if match.groups() else None
-                
-                if pattern_name.startswith("create_"):
-                    return TaskType.GENERATE, {
-                        "generate_type": pattern_name.replace("create_", ""),
-                        "name": extracted.get("match")
-                    }
-                elif pattern_name == "explain":
-                    return TaskType.EXPLAIN, {"target": extracted.get("match")}
-                elif pattern_name == "refactor":
-                    return TaskType.REFACTOR, {"target": extracted.get("match")}
-                elif pattern_name == "fix":
-                    return TaskType.FIX, {"target": extracted.get("match")}
-        
-        # Default to generate
-        return TaskType.GENERATE, {}
+    Results are cached, including the no-match default, so repeated prompts
+    skip the regex scan. Extracted data is returned as (key, value) pairs so
+    cached entries cannot be mutated by callers.
+    """
+    match = intent_pattern.search(prompt)
     
-    def _handle_generate(self, task: AITask) -> Dict:
-        """Handle code generation tasks."""
-        context = task.context or {}
-        generate_type = context.get("generate_type", "generic")
-        name = context.get("name", "Generated")
-        
-        if generate_type == "class":
-            result = self.code_generator.generate_class(
-                class_name=name,
-                description=task.prompt
-            )
-        elif generate_type == "function":
-            result = self.code_generator.generate(
-                "python_function",
-                function_name=name,
-                params="",
-                return_type="None",
-                docstring=task.prompt,
-                args_doc="",
-                return_doc="None",
-                body="pass"
-            )
-        elif generate_type == "screen":
-            result = self.code_generator.generate_kivy_screen(
-                screen_name=name,
-                description=task.prompt
-            )
-        else:
-            # Generic generation based on prompt analysis
-            result = self._generate_from_prompt(task.prompt)
+    if match:
+        pattern_name = match.lastgroup
+        target_group = _TARGET_GROUPS[intent_pattern][pattern_name]
+        target = match.group(target_group) if target_group is not None else None
         
-        return {
-            "type": "generated_code",
-            "language": result.language.value,
-            "code": result.code,
-            "description": result.description
-        }
-    
-    def _generate_from_prompt(self, prompt: str):
-        """Generate code from a free-form prompt."""
-        # Analyze prompt for keywords
-        prompt_lower = prompt.lower()
-        
-        if "api" in prompt_lower or "endpoint" in prompt_lower:
-            return self._generate_api_handler(prompt)
-        elif "test" in prompt_lower:
-            return self._generate_test(prompt)
-        elif "config" in prompt_lower:
-            return self._generate_config(prompt)
-        else:
-            # Default: generate a utility function
-            return self.code_generator.generate(
-                "python_function",
-                function_name="generated_function",
-                params="*args, **kwargs",
-                return_type="Any",
-                docstring=prompt,
-                args_doc="args: Variable arguments\n        kwargs: Keyword arguments",
-                return_doc="Result based on implementation",
-                body=f"# TODO: Implement based on: {prompt}\n    raise NotImplementedError()"
+        if pattern_name.startswith("create_"):
+            return TaskType.GENERATE, (
+                ("generate_type", pattern_name.replace("create_", "")),
+                ("name", target)
             )
-    
-    def _generate_api_handler(self, prompt: str):
-        """Generate an API handler."""
-        code = '''"""
+        elif pattern_name == "explain":
+            return TaskType.EXPLAIN, (("target", target),)
+        elif pattern_name == "refactor":
+            return TaskType.REFACTOR, (("target", target),)
+        elif pattern_name == "fix":
+            return TaskType.FIX, (("target", target),)
+    
+    # Default to generate
+    return TaskType.GENERATE, ()
+
+
+# Static templates for free-form generation, built once and shared
+_API_HANDLER_CODE = '''"""
 API Handler - Generated
 """
 
@@ -320,16 +209,9 @@ class APIHandler:
         """POST request."""
         return await self.request("POST", endpoint, data)
 '''
-        from .code_generator import GeneratedCode
-        return GeneratedCode(
-            language=Language.PYTHON,
-            code=code,
-            description="API Handler class"
-        )
-    
-    def _generate_test(self, prompt: str):
-        """Generate test code."""
-        code = '''"""
+
+
+_TEST_CODE = '''"""
 Unit Tests - Generated
 """
 
@@ -361,16 +243,9 @@ class TestGenerated(unittest.TestCase):
 if __name__ == '__main__':
     unittest.main()
 '''
-        from .code_generator import GeneratedCode
-        return GeneratedCode(
-            language=Language.PYTHON,
-            code=code,
-            description="Unit test template"
-        )
-    
-    def _generate_config(self, prompt: str):
-        """Generate configuration code."""
-        code = '''"""
+
+
+_CONFIG_CODE = '''"""
 Configuration Module - Generated
 """
 
@@ -416,11 +291,284 @@ class Config:
         """Set configuration value."""
         self._config[key] = value
 '''
-        from .code_generator import GeneratedCode
-        return GeneratedCode(
-            language=Language.PYTHON,
-            code=code,
-            description="Configuration manager"
+
+
+# Static templates in their final _handle_generate result shape. These dicts
+# are shared between responses, so callers must treat them as read-only.
+_STATIC_RESULTS: Dict[str, Dict] = {
+    "api": {
+        "type": "generated_code",
+        "language": Language.PYTHON.value,
+        "code": _API_HANDLER_CODE,
+        "description": "API Handler class"
+    },
+    "test": {
+        "type": "generated_code",
+        "language": Language.PYTHON.value,
+        "code": _TEST_CODE,
+        "description": "Unit test template"
+    },
+    "config": {
+        "type": "generated_code",
+        "language": Language.PYTHON.value,
+        "code": _CONFIG_CODE,
+        "description": "Configuration manager"
+    },
+}
+
+
+def _match_template(prompt: str) -> Optional[str]:
+    """Pick the static template named by keywords in a prompt, if any."""
+    # Analyze prompt for keywords in a single pass
+    keywords = set(_KEYWORD_RE.findall(prompt.lower()))
+    
+    if "api" in keywords or "endpoint" in keywords:
+        return "api"
+    elif "test" in keywords:
+        return "test"
+    elif "config" in keywords:
+        return "config"
+    return None
+
+
+class AIRuntime:
+    """
+    AI Runtime for DroidForge.
+    
+    This is a standalone AI system that provides:
+    - Code generation based on prompts
+    - Code analysis and explanation
+    - Refactoring suggestions
+    - Pattern-based code completion
+    
+    Note: This is an independent implementation, not using
+    any third-party AI services or proprietary APIs.
+    """
+    
+    def __init__(self, config_manager, event_bus,
+                 patterns: Dict[str, str] = None):
+        self.config = config_manager
+        self.event_bus = event_bus
+        self.logger = get_logger("AIRuntime")
+        
+        # Initialize components
+        self.code_generator = CodeGenerator(config_manager)
+        
+        # Task handlers
+        self._handlers: Dict[TaskType, Callable] = {
+            TaskType.GENERATE: self._handle_generate,
+            TaskType.REFACTOR: self._handle_refactor,
+            TaskType.EXPLAIN: self._handle_explain,
+            TaskType.ANALYZE: self._handle_analyze,
+            TaskType.COMPLETE: self._handle_complete,
+            TaskType.FIX: self._handle_fix,
+        }
+        self._handler_table = tuple(self._handlers.get(t) for t in TaskType)
+        
+        # Pattern matchers for intent detection (shared unless overridden)
+        if patterns is None:
+            self._intent_pattern = _default_intent_pattern()
+        else:
+            self._intent_pattern = _fuse_patterns(patterns)
+        
+        # Responses for repeated (prompt, context) pairs
+        self._prompt_cache: OrderedDict = OrderedDict()
+        self._prompt_cache_lock = threading.Lock()
+        self._prompt_cache_size = config_manager.get("ai.prompt_cache_size", 128)
+        
+        # Analysis results for repeated (code, language) pairs
+        self._analysis_cache: OrderedDict = OrderedDict()
+        self._analysis_cache_size = config_manager.get("ai.analysis_cache_size", 64)
+        
+        # Configuration changes may alter generated output
+        for event_name in ("config_changed", "config_reset", "config_imported"):
+            self.event_bus.subscribe(event_name, self.clear_cache)
+        self.event_bus.subscribe("code_changed", self._clear_analysis_cache)
+        
+        self.logger.info("AI Runtime initialized")
+    
+    def clear_cache(self, *args):
+        """Drop cached intent matches, prompt responses and code analyses."""
+        _detect_intent_cached.cache_clear()
+        with self._prompt_cache_lock:
+            self._prompt_cache.clear()
+        self._analysis_cache.clear()
+    
+    def _clear_analysis_cache(self, *args):
+        """Drop cached code analyses."""
+        self._analysis_cache.clear()
+    
+    def _analyze_code(self, code: str, language: Language = Language.PYTHON) -> Dict:
+        """Analyze code, reusing the result for code seen recently."""
+        key = (code, language)
+        
+        analysis = self._analysis_cache.get(key)
+        if analysis is not None:
+            self._analysis_cache.move_to_end(key)
+            return analysis
+        
+        analysis = self.code_generator.analyze_code(code, language)
+        self._analysis_cache[key] = analysis
+        if len(self._analysis_cache) > self._analysis_cache_size:
+            self._analysis_cache.popitem(last=False)
+        
+        return analysis
+    
+    def process(self, task: AITask) -> AIResponse:
+        """
+        Process an AI task.
+        
+        Args:
+            task: AITask to process
+            
+        Returns:
+            AIResponse with results
+        """
+        start_ns = time.perf_counter_ns()
+        task_type = task.task_type
+        task_type_value = task_type.value
+        
+        self.logger.info("Processing AI task: %s", task_type_value)
+        
+        try:
+            handler = self._handler_table[task_type._index]
+        except AttributeError:
+            handler = self._handlers.get(task_type)
+        if not handler:
+            return AIResponse(
+                success=False,
+                result={"error": f"Unknown task type: {task_type}"},
+                task_type=task_type,
+                processing_time_ms=0
+            )
+        
+        with self.event_bus.span("ai_task", task_type_value) as outcome:
+            try:
+                result = handler(task)
+                success = True
+            except Exception as e:
+                self.logger.error("AI task failed: %s", e)
+                result = {"error": str(e)}
+                success = False
+            
+            elapsed_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+            
+            response = AIResponse(
+                success=success,
+                result=result,
+                task_type=task_type,
+                processing_time_ms=elapsed_ms
+            )
+            outcome.append(success)
+        
+        return response
+    
+    def process_prompt(self, prompt: str, context: Dict = None) -> AIResponse:
+        """
+        Process a natural language prompt.
+        
+        Args:
+            prompt: Natural language instruction
+            context: Additional context
+            
+        Returns:
+            AIResponse with results
+        
+        Successful responses are cached per (prompt, context) pair, so a
+        repeated request returns the same AIResponse without re-processing.
+        Cached responses, and their result dicts, are shared between callers
+        and must be treated as read-only; processing_time_ms is that of the
+        original request. Hits still emit ai_task_started/ai_task_completed.
+        Contexts with unhashable values are never cached.
+        """
+        context_key = _hash_context(context)
+        cache_key = (prompt, context_key) if context_key is not None else None
+        
+        if cache_key is not None:
+            with self._prompt_cache_lock:
+                cached = self._prompt_cache.get(cache_key)
+                if cached is not None:
+                    self._prompt_cache.move_to_end(cache_key)
+            if cached is not None:
+                with self.event_bus.span("ai_task", cached.task_type.value) as outcome:
+                    outcome.append(True)
+                return cached
+        
+        # Detect intent from prompt; the cached pairs are merged directly
+        task_type, extracted_data = _detect_intent_cached(self._intent_pattern, prompt)
+        
+        task_context = {} if context is None else dict(context)
+        if extracted_data:
+            task_context.update(extracted_data)
+        
+        task = AITask(
+            task_type=task_type,
+            prompt=prompt,
+            context=task_context
+        )
+        
+        response = self.process(task)
+        
+        if cache_key is not None and response.success:
+            with self._prompt_cache_lock:
+                self._prompt_cache[cache_key] = response
+                if len(self._prompt_cache) > self._prompt_cache_size:
+                    self._prompt_cache.popitem(last=False)
+        
+        return response
+    
+    def _handle_generate(self, task: AITask) -> Dict:
+        """Handle code generation tasks."""
+        context = task.context or {}
+        generate_type = context.get("generate_type", "generic")
+        name = context.get("name", "Generated")
+        
+        if generate_type == "class":
+            result = self.code_generator.generate_class(
+                class_name=name,
+                description=task.prompt
+            )
+        elif generate_type == "function":
+            result = self.code_generator.generate(
+                "python_function",
+                function_name=name,
+                params="",
+                return_type="None",
+                docstring=task.prompt,
+                args_doc="",
+                return_doc="None",
+                body="pass"
+            )
+        elif generate_type == "screen":
+            result = self.code_generator.generate_kivy_screen(
+                screen_name=name,
+                description=task.prompt
+            )
+        else:
+            # Generic generation based on prompt analysis
+            template = _match_template(task.prompt)
+            if template is not None:
+                return _STATIC_RESULTS[template]
+            result = self._generate_utility_function(task.prompt)
+        
+        return {
+            "type": "generated_code",
+            "language": result.language.value,
+            "code": result.code,
+            "description": result.description
+        }
+    
+    def _generate_utility_function(self, prompt: str):
+        """Generate a utility function stub for a free-form prompt."""
+        return self.code_generator.generate(
+            "python_function",
+            function_name="generated_function",
+            params="*args, **kwargs",
+            return_type="Any",
+            docstring=prompt,
+            args_doc="args: Variable arguments\n        kwargs: Keyword arguments",
+            return_doc="Result based on implementation",
+            body=f"# TODO: Implement based on: {prompt}\n    raise NotImplementedError()"
         )
     
     def _handle_refactor(self, task: AITask) -> Dict:
@@ -443,7 +591,7 @@ class Config:
         code = task.context.get("code", "")
         
         if code:
-            analysis = self.code_generator.analyze_code(code)
+            analysis = self._analyze_code(code)
             
             explanation = f"""Code Analysis:
 - Lines of code: {analysis.get('lines', 0)}
@@ -469,7 +617,7 @@ class Config:
         code = task.context.get("code", "")
         language = task.language
         
-        analysis = self.code_generator.analyze_code(code, language)
+        analysis = self._analyze_code(code, language)
         
         return {
             "type": "analysis",
@@ -493,14 +641,15 @@ class Config:
         """Generate code completions."""
         completions = []
         
-        # Get line at cursor
-        lines = code[:cursor].split('\n')
-        current_line = lines[-1] if lines else ""
+        # Get line at cursor without copying the text before it
+        line_start = code.rfind('\n', 0, cursor) + 1
+        current_line = code[line_start:cursor]
+        stripped = current_line.strip()
         
         # Basic keyword completions
-        if current_line.strip().startswith("def"):
+        if stripped.startswith("def"):
             completions.extend(["__init__(self):", "__str__(self):"])
-        elif current_line.strip().startswith("class"):
+        elif stripped.startswith("class"):
             completions.extend([":", "(object):"])
         elif "import" in current_line:
             completions.extend(["os", "sys", "json", "typing"])
@@ -512,20 +661,13 @@ class Config:
         code = task.context.get("code", "")
         error = task.context.get("error", "")
         
-        # Simple fixes based on common errors
-        fixes = []
-        fixed_code = code
+        # Simple fixes based on common errors, found in one scan
+        found = set(_ERROR_RE.findall(error))
+        fixes = [fix for error_type, fix in _ERROR_FIXES.items() if error_type in found]
         
-        if "IndentationError" in error:
-            # Fix indentation
+        fixed_code = code
+        if "IndentationError" in found:
             fixed_code = self._fix_indentation(code)
-            fixes.append("Fixed indentation")
-        
-        if "NameError" in error:
-            fixes.append("Check for undefined variables or missing imports")
-        
-        if "SyntaxError" in error:
-            fixes.append("Check for missing colons, brackets, or quotes")
         
         return {
             "type": "fix",
@@ -541,12 +683,5 @@ class Config:
     
     def _fix_indentation(self, code: str) -> str:
         """Fix common indentation issues."""
-        lines = code.split('\n')
-        fixed_lines = []
-        
-        for line in lines:
-            # Convert tabs to spaces
-            line = line.replace('\t', '    ')
-            fixed_lines.append(line)
-        
-        return '\n'.join(fixed_lines)
+        # Convert tabs to spaces, aligned to 4-column tab stops
+        return code.expandtabs(4)
@@ -1,6 +1,76 @@
+"""
+DroidForge Lightweight Logger
+=============================
+Level-gated logger shared by all components.
+"""
+
+import os
+import sys
+import traceback
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+CRITICAL = 50
+
+
+class _Logger:
+    """Writes messages at or above the configured level to stderr."""
+
+    def __init__(self, level: int = WARNING):
+        self.level = level
+
+    def isEnabledFor(self, level: int) -> bool:
+        """Check whether messages at this level would be written."""
+        return level >= self.level
+
+    def _log(self, level: int, msg, args, exc_info=False):
+        if level < self.level:
+            return
+        text = str(msg) % args if args else str(msg)
+        if exc_info:
+            text = f"{text}\n{traceback.format_exc().rstrip()}"
+        sys.stderr.write(text + "\n")
+
+    def debug(self, msg, *args, exc_info=False):
+        self._log(DEBUG, msg, args, exc_info)
+
+    def info(self, msg, *args, exc_info=False):
+        self._log(INFO, msg, args, exc_info)
+
+    def warning(self, msg, *args, exc_info=False):
+        self._log(WARNING, msg, args, exc_info)
+
+    def error(self, msg, *args, exc_info=False):
+        self._log(ERROR, msg, args, exc_info)
+
+    def critical(self, msg, *args, exc_info=False):
+        self._log(CRITICAL, msg, args, exc_info)
+
+
+_LEVEL_NAMES = {
+    "DEBUG": DEBUG,
+    "INFO": INFO,
+    "WARNING": WARNING,
+    "ERROR": ERROR,
+    "CRITICAL": CRITICAL,
+}
+
+
+def _parse_level(value) -> int:
+    """Accept a level name or number; anything else means WARNING."""
+    if value is None:
+        return WARNING
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    return _LEVEL_NAMES.get(value.upper(), WARNING)
+
+
+_SINGLETON = _Logger(level=_parse_level(os.environ.get("DROIDFORGE_LOG_LEVEL")))
+
+
 def get_logger(name=None):
-    class Logger:
-        def info(self, msg): print(msg)
-        def error(self, msg): print(msg)
-        def warning(self, msg): print(msg)
-    return Logger()
+    """Return the shared logger; the name is accepted for call-site clarity."""
+    return _SINGLETON
@@ -5,17 +5,104 @@ Declarative workflow definition and execution system.
 Enables complex multi-step automation with dependency resolution.
 """
 
+import ast
+import hashlib
 import json
+import os
+import pickle
+import random
+import re
+import sys
+import time
 import yaml
 from typing import Dict, List, Optional, Any, Callable
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from enum import Enum
 from datetime import datetime
 import threading
 import queue
+from collections import OrderedDict, defaultdict, deque
+from pathlib import Path
 
 from utils.logger import get_logger
 
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+# libyaml's C loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# ${steps.<id>.result} (group 1) or ${<variable>} (group 2)
+_INTERP_RE = re.compile(r"\$\{(?:steps\.([^}]+)\.result|([^}]+))\}")
+
+# AST nodes a step condition may contain: comparisons, boolean logic,
+# literals and ${var} / ${steps.<id>.result} placeholders
+_COND_NODES = (
+    ast.Expression, ast.Compare, ast.BoolOp, ast.UnaryOp, ast.Name,
+    ast.Constant, ast.Tuple, ast.List, ast.Load,
+    ast.And, ast.Or, ast.Not,
+    ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+    ast.In, ast.NotIn, ast.Is, ast.IsNot,
+)
+
+# Condition template -> (code object, {local name: (step id, variable name)})
+_COND_CACHE: Dict[str, tuple] = {}
+
+
+def _compile_condition(condition: str) -> tuple:
+    """
+    Compile a condition template once, validating it against _COND_NODES.
+    
+    Each placeholder becomes a local name bound at evaluation time.
+    
+    Args:
+        condition: Raw condition string
+        
+    Returns:
+        Tuple of (code object, mapping of local names to the (step id,
+        variable name) groups of their placeholder)
+    """
+    cached = _COND_CACHE.get(condition)
+    if cached is not None:
+        return cached
+    
+    locals_by_placeholder: Dict[str, str] = {}
+    names: Dict[str, tuple] = {}
+    
+    def placeholder(match):
+        local = locals_by_placeholder.get(match.group(0))
+        if local is None:
+            local = f"_v{len(names)}"
+            locals_by_placeholder[match.group(0)] = local
+            names[local] = match.groups()
+        return local
+    
+    source = _INTERP_RE.sub(placeholder, condition)
+    tree = ast.parse(source, mode="eval")
+    for node in ast.walk(tree):
+        if not isinstance(node, _COND_NODES):
+            raise ValueError(f"Unsupported expression: {type(node).__name__}")
+        if isinstance(node, ast.Name) and node.id not in names:
+            raise ValueError(f"Unknown name: {node.id}")
+    
+    # A placeholder written inside quotes was rewritten into the literal
+    # text instead of becoming a name, which would compare a constant
+    referenced = {n.id for n in ast.walk(tree) if isinstance(n, ast.Name)}
+    if not referenced.issuperset(names):
+        raise ValueError("placeholder inside string literal")
+    
+    compiled = (compile(tree, "<condition>", "eval"), names)
+    _COND_CACHE[condition] = compiled
+    return compiled
+
+
+def _intern(value):
+    """Intern strings; YAML may hand back other scalar types."""
+    return sys.intern(value) if isinstance(value, str) else value
+
 
 class StepStatus(Enum):
     """Workflow step status."""
@@ -26,7 +113,7 @@ class StepStatus(Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowStep:
     """A single step in a workflow."""
     id: str
@@ -37,16 +124,32 @@ class WorkflowStep:
     condition: Optional[str] = None
     timeout: int = 300
     retry_count: int = 0
+    retry_backoff: float = 0.1
+    retry_on: Optional[List[str]] = None
+    cacheable: bool = False
     
-    # Runtime state
+    def __post_init__(self):
+        # Ids, commands and param keys repeat across steps and workflows;
+        # interning shares one copy and speeds up dict lookups on them
+        self.id = _intern(self.id)
+        self.command = _intern(self.command)
+        self.depends_on = [_intern(d) for d in self.depends_on]
+        self.params = {_intern(k): v for k, v in self.params.items()}
+
+
+@dataclass(slots=True)
+class StepState:
+    """Runtime state of one step within a single workflow run."""
     status: StepStatus = StepStatus.PENDING
     result: Any = None
     error: Optional[str] = None
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
+    # time.perf_counter_ns() readings; 0 until set (see WorkflowRun.to_datetime)
+    started_at: int = 0
+    completed_at: int = 0
+    cache_key: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowDefinition:
     """Definition of a complete workflow."""
     id: str
@@ -58,11 +161,102 @@ class WorkflowDefinition:
     on_success: Optional[str] = None
     on_failure: Optional[str] = None
     
+    # Execution plan, computed once by plan()
+    _by_id: Optional[Dict[str, WorkflowStep]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _in_degree: Optional[Dict[str, int]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _successors: Optional[Dict[str, List[str]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _levels: Optional[List[List[str]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def plan(self) -> List[List[str]]:
+        """
+        Topologically sort the steps with Kahn's algorithm.
+        
+        Stores the step index, dependency counts, successor map and
+        wavefront levels so every run can share them. Dependencies on
+        unknown steps are ignored.
+        
+        Returns:
+            Step IDs grouped into levels that can run concurrently
+        """
+        by_id = {s.id: s for s in self.steps}
+        in_degree: Dict[str, int] = {}
+        successors: Dict[str, List[str]] = defaultdict(list)
+        for step in self.steps:
+            known = [d for d in step.depends_on if d in by_id]
+            in_degree[step.id] = len(known)
+            for dep_id in known:
+                successors[dep_id].append(step.id)
+        
+        levels = []
+        remaining = dict(in_degree)
+        frontier = [s.id for s in self.steps if in_degree[s.id] == 0]
+        while frontier:
+            levels.append(frontier)
+            next_frontier = []
+            for step_id in frontier:
+                for succ_id in successors.get(step_id, ()):
+                    remaining[succ_id] -= 1
+                    if remaining[succ_id] == 0:
+                        next_frontier.append(succ_id)
+            frontier = next_frontier
+        
+        self._by_id = by_id
+        self._in_degree = in_degree
+        self._successors = dict(successors)
+        self._levels = levels
+        return levels
+    
+    def validate(self) -> List[str]:
+        """
+        Validate the step graph, planning it as a side effect.
+        
+        Returns:
+            List of validation errors (empty if valid)
+        """
+        errors = []
+        
+        seen = set()
+        for step in self.steps:
+            if step.id in seen:
+                errors.append(f"Duplicate step id: {step.id}")
+            seen.add(step.id)
+        
+        for step in self.steps:
+            for dep_id in step.depends_on:
+                if dep_id not in seen:
+                    errors.append(f"Step {step.id} depends on unknown step: {dep_id}")
+        
+        # Steps Kahn's sort never reaches are on, or behind, a cycle
+        planned = {step_id for level in self.plan() for step_id in level}
+        leftover = [s.id for s in self.steps if s.id not in planned]
+        if leftover:
+            errors.append(f"Dependency cycle through steps: {leftover}")
+        
+        return errors
+    
     @classmethod
     def from_dict(cls, data: Dict) -> 'WorkflowDefinition':
         """Create workflow from dictionary."""
         steps = []
         for step_data in data.get('steps', []):
+            # A scalar YAML value means a single entry
+            retry_on = step_data.get('retry_on')
+            if isinstance(retry_on, str):
+                retry_on = [retry_on]
+            elif retry_on is not None and not isinstance(retry_on, list):
+                raise ValueError(
+                    f"Step {step_data['id']}: retry_on must be a string or list, "
+                    f"not {type(retry_on).__name__}"
+                )
+            
             steps.append(WorkflowStep(
                 id=step_data['id'],
                 name=step_data.get('name', step_data['id']),
@@ -71,7 +265,10 @@ class WorkflowDefinition:
                 depends_on=step_data.get('depends_on', []),
                 condition=step_data.get('condition'),
                 timeout=step_data.get('timeout', 300),
-                retry_count=step_data.get('retry_count', 0)
+                retry_count=step_data.get('retry_count', 0),
+                retry_backoff=step_data.get('retry_backoff', 0.1),
+                retry_on=retry_on,
+                cacheable=step_data.get('cacheable', False)
             ))
         
         return cls(
@@ -86,11 +283,30 @@ class WorkflowDefinition:
         )
     
     @classmethod
-    def from_yaml(cls, yaml_content: str) -> 'WorkflowDefinition':
-        """Create workflow from YAML string."""
-        data = yaml.safe_load(yaml_content)
+    def from_yaml(cls, source) -> 'WorkflowDefinition':
+        """Create workflow from a YAML string or readable stream."""
+        data = yaml.load(source, Loader=_YAML_LOADER)
         return cls.from_dict(data)
     
+    @classmethod
+    def from_yaml_file(cls, path) -> 'WorkflowDefinition':
+        """Create workflow from a YAML file, parsed as it is read."""
+        with open(path, 'rb') as f:
+            return cls.from_yaml(f)
+    
+    @classmethod
+    def from_json(cls, data) -> 'WorkflowDefinition':
+        """Create workflow from JSON text or bytes."""
+        if msgspec is not None:
+            return cls.from_dict(msgspec.json.decode(data))
+        return cls.from_dict(json.loads(data))
+    
+    def to_json(self) -> bytes:
+        """Serialize to UTF-8 JSON, using msgspec when it is installed."""
+        if msgspec is not None:
+            return msgspec.json.encode(self.to_dict())
+        return json.dumps(self.to_dict(), separators=(',', ':')).encode()
+    
     def to_dict(self) -> Dict:
         """Convert to dictionary."""
         return {
@@ -106,7 +322,10 @@ class WorkflowDefinition:
                     'depends_on': s.depends_on,
                     'condition': s.condition,
                     'timeout': s.timeout,
-                    'retry_count': s.retry_count
+                    'retry_count': s.retry_count,
+                    'retry_backoff': s.retry_backoff,
+                    'retry_on': s.retry_on,
+                    'cacheable': s.cacheable
                 }
                 for s in self.steps
             ],
@@ -117,65 +336,301 @@ class WorkflowDefinition:
         }
 
 
+# Schema tag for pickled workflow caches; changes whenever a field is added,
+# removed or renamed, so stale pickles are never reused
+_WORKFLOW_CACHE_SCHEMA = hashlib.sha256(repr([
+    (cls.__name__, [f.name for f in fields(cls)])
+    for cls in (WorkflowStep, WorkflowDefinition)
+]).encode()).hexdigest()[:12]
+
+
+def _is_complete_workflow(obj) -> bool:
+    """Check that an unpickled object is a WorkflowDefinition with every slot set."""
+    if not isinstance(obj, WorkflowDefinition):
+        return False
+    if not all(hasattr(obj, f.name) for f in fields(WorkflowDefinition)):
+        return False
+    return all(
+        isinstance(step, WorkflowStep)
+        and all(hasattr(step, f.name) for f in fields(WorkflowStep))
+        for step in obj.steps
+    )
+
+
 class WorkflowRun:
     """A single execution of a workflow."""
     
+    __slots__ = (
+        "workflow", "run_id", "status", "started_at", "completed_at",
+        "variables", "step_results", "_interp_cache", "lock", "step_state",
+        "_pending_count", "_running_count", "_failed_count",
+        "_by_id", "_in_degree", "_successors", "ready_queue",
+        "_outstanding", "_done", "_wall_start", "_perf_start",
+    )
+    
     def __init__(self, workflow: WorkflowDefinition, run_id: str):
         self.workflow = workflow
         self.run_id = run_id
         self.status = "pending"
-        self.started_at = None
-        self.completed_at = None
+        
+        # Timestamps are time.perf_counter_ns() readings (0 until set),
+        # anchored to wall-clock time when the run is created
+        self.started_at = 0
+        self.completed_at = 0
+        self._wall_start = time.time()
+        self._perf_start = time.perf_counter_ns()
         self.variables = dict(workflow.variables)
         self.step_results: Dict[str, Any] = {}
         
-        # Reset step states
-        for step in self.workflow.steps:
-            step.status = StepStatus.PENDING
-            step.result = None
-            step.error = None
+        # Resolved placeholder text, keyed by the full "${...}" placeholder
+        self._interp_cache: Dict[str, str] = {}
+        
+        # Guards step status and results while steps run in parallel
+        self.lock = threading.Lock()
+        
+        # Per-run step state; the definition's steps are never mutated
+        self.step_state: Dict[str, StepState] = {
+            s.id: StepState() for s in workflow.steps
+        }
+        
+        # Live status counts, maintained by _set_status
+        self._pending_count = len(self.step_state)
+        self._running_count = 0
+        self._failed_count = 0
+        
+        # Share the workflow's precomputed plan; only the dependency
+        # counters are per run
+        if workflow._levels is None:
+            workflow.plan()
+        self._by_id = workflow._by_id
+        self._in_degree = dict(workflow._in_degree)
+        self._successors = workflow._successors
+        
+        # Scheduled steps not yet finished, and the run's completion signal
+        self._outstanding = 0
+        self._done = threading.Event()
+        
+        self.ready_queue = deque(
+            self._by_id[step_id] for step_id in workflow._levels[0]
+        ) if workflow._levels else deque()
     
     def get_ready_steps(self) -> List[WorkflowStep]:
-        """Get steps that are ready to execute."""
-        ready = []
+        """Pop and return all steps whose dependencies have succeeded."""
+        with self.lock:
+            ready = list(self.ready_queue)
+            self.ready_queue.clear()
+        return ready
+    
+    def to_datetime(self, ns: int) -> Optional[datetime]:
+        """Convert a perf_counter_ns() timestamp from this run to a datetime."""
+        if not ns:
+            return None
+        return datetime.fromtimestamp(self._wall_start + (ns - self._perf_start) / 1e9)
+    
+    @property
+    def started_datetime(self) -> Optional[datetime]:
+        """Wall-clock start time of the run."""
+        return self.to_datetime(self.started_at)
+    
+    @property
+    def completed_datetime(self) -> Optional[datetime]:
+        """Wall-clock completion time of the run."""
+        return self.to_datetime(self.completed_at)
+    
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Block until the run has finished.
         
-        for step in self.workflow.steps:
-            if step.status != StepStatus.PENDING:
-                continue
-            
-            # Check dependencies
-            deps_satisfied = True
-            for dep_id in step.depends_on:
-                dep_step = self._get_step(dep_id)
-                if dep_step and dep_step.status != StepStatus.SUCCESS:
-                    deps_satisfied = False
-                    break
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
             
-            if deps_satisfied:
-                ready.append(step)
+        Returns:
+            True if the run finished within the timeout
+        """
+        return self._done.wait(timeout)
+    
+    def set_variables(self, variables: Dict[str, Any]):
+        """Override run variables, dropping any cached placeholder text."""
+        self.variables.update(variables)
+        self._interp_cache.clear()
+    
+    def resolve_placeholder(self, match) -> str:
+        """
+        Substitution callback for _INTERP_RE.
         
-        return ready
+        Unknown variables and results of steps that have not succeeded are
+        left in place.
+        """
+        placeholder = match.group(0)
+        cached = self._interp_cache.get(placeholder)
+        if cached is not None:
+            return cached
+        
+        step_id = match.group(1)
+        if step_id is not None and step_id in self.step_results:
+            text = str(self.step_results[step_id])
+        elif step_id is None and match.group(2) in self.variables:
+            text = str(self.variables[match.group(2)])
+        else:
+            return placeholder
+        
+        self._interp_cache[placeholder] = text
+        return text
     
-    def _get_step(self, step_id: str) -> Optional[WorkflowStep]:
-        """Get a step by ID."""
-        for step in self.workflow.steps:
-            if step.id == step_id:
-                return step
-        return None
+    def mark_success(self, step_id: str):
+        """
+        Release the successors of a step that has succeeded.
+        
+        Must be called with the run lock held.
+        
+        Args:
+            step_id: ID of the step that succeeded
+        """
+        for succ_id in self._successors.get(step_id, ()):
+            self._in_degree[succ_id] -= 1
+            if self._in_degree[succ_id] == 0:
+                self.ready_queue.append(self._by_id[succ_id])
+    
+    def _set_status(self, state: StepState, status: StepStatus):
+        """
+        Move a step to a new status, keeping the live counts in step.
+        
+        Must be called with the run lock held.
+        """
+        old = state.status
+        if old == StepStatus.PENDING:
+            self._pending_count -= 1
+        elif old == StepStatus.RUNNING:
+            self._running_count -= 1
+        elif old == StepStatus.FAILED:
+            self._failed_count -= 1
+        
+        if status == StepStatus.PENDING:
+            self._pending_count += 1
+        elif status == StepStatus.RUNNING:
+            self._running_count += 1
+        elif status == StepStatus.FAILED:
+            self._failed_count += 1
+        
+        state.status = status
     
     def is_complete(self) -> bool:
         """Check if all steps are complete."""
-        for step in self.workflow.steps:
-            if step.status in (StepStatus.PENDING, StepStatus.RUNNING):
-                return False
-        return True
+        return self._pending_count == 0 and self._running_count == 0
     
     def is_success(self) -> bool:
         """Check if workflow completed successfully."""
-        for step in self.workflow.steps:
-            if step.status == StepStatus.FAILED:
-                return False
-        return self.is_complete()
+        return self._failed_count == 0 and self.is_complete()
+
+
+class _WorkStealingPool:
+    """
+    Fixed pool of worker threads, each with its own task deque.
+    
+    Submitted tasks go to the least-loaded worker. A worker runs its
+    newest task first and, when its deque is empty, steals the oldest
+    half of a random peer's deque.
+    """
+    
+    def __init__(self, num_workers: int, name: str = "workflow"):
+        self.logger = get_logger("WorkflowEngine")
+        self._queues = [deque() for _ in range(num_workers)]
+        self._locks = [threading.Lock() for _ in range(num_workers)]
+        
+        # Count of queued tasks; idle workers sleep on the condition
+        self._queued = 0
+        self._cond = threading.Condition()
+        self._shutdown = False
+        
+        self._workers = [
+            threading.Thread(
+                target=self._worker_loop,
+                args=(index,),
+                daemon=True,
+                name=f"{name}-{index}"
+            )
+            for index in range(num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+    
+    def submit(self, fn: Callable, *args):
+        """
+        Queue fn(*args) on the least-loaded worker.
+        
+        After shutdown only the workers themselves may submit, so tasks
+        still draining can queue their follow-up work.
+        """
+        if self._shutdown and threading.current_thread() not in self._workers:
+            raise RuntimeError("Workflow pool is shut down")
+        index = min(range(len(self._queues)), key=lambda i: len(self._queues[i]))
+        with self._locks[index]:
+            self._queues[index].append((fn, args))
+        with self._cond:
+            self._queued += 1
+            self._cond.notify()
+    
+    def _take(self, index: int):
+        """Pop a task from this worker's deque, stealing if it is empty."""
+        with self._locks[index]:
+            if self._queues[index]:
+                return self._queues[index].pop()
+        
+        peers = [i for i in range(len(self._queues)) if i != index]
+        random.shuffle(peers)
+        for victim in peers:
+            with self._locks[victim]:
+                victim_queue = self._queues[victim]
+                if not victim_queue:
+                    continue
+                count = max(1, len(victim_queue) // 2)
+                stolen = [victim_queue.popleft() for _ in range(count)]
+            
+            task = stolen.pop()
+            if stolen:
+                with self._locks[index]:
+                    self._queues[index].extend(stolen)
+            return task
+        
+        return None
+    
+    def _worker_loop(self, index: int):
+        """Run tasks until shutdown has been requested and the queues are empty."""
+        while True:
+            with self._cond:
+                while self._queued == 0 and not self._shutdown:
+                    self._cond.wait()
+                if self._shutdown and self._queued == 0:
+                    return
+            
+            task = self._take(index)
+            if task is None:
+                continue
+            with self._cond:
+                self._queued -= 1
+            
+            fn, args = task
+            try:
+                fn(*args)
+            except Exception as e:
+                self.logger.error(f"Workflow task failed: {e}", exc_info=True)
+    
+    def shutdown(self, wait: bool = True):
+        """
+        Stop accepting outside work and let the workers drain the queues.
+        
+        Queued tasks, and any tasks they submit, still run, so every
+        in-flight workflow run reaches completion.
+        
+        Args:
+            wait: Block until all workers have exited
+        """
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
 
 
 class WorkflowEngine:
@@ -199,11 +654,62 @@ class WorkflowEngine:
         
         # Workflow storage
         self._workflows: Dict[str, WorkflowDefinition] = {}
-        self._runs: Dict[str, WorkflowRun] = {}
+        
+        # Most recent runs in start order, capped at workflow.run_history_max
+        self._runs: Dict[str, WorkflowRun] = OrderedDict()
+        self._runs_lock = threading.Lock()
+        
+        # Results of cacheable steps, least recently used first:
+        # cache key -> (expires_at, result)
+        self._step_cache: Dict[str, tuple] = OrderedDict()
+        self._step_cache_lock = threading.Lock()
+        
+        # Work-stealing pool shared by the steps of all runs
+        max_parallel = self.config.get("workflow.max_parallel", os.cpu_count())
+        self._pool = _WorkStealingPool(max(1, max_parallel or 1))
+        self._closed = False
+        
+        # Workflow events are handed to a dispatcher thread so subscriber
+        # latency stays off the step execution path
+        self._event_queue: queue.Queue = queue.Queue()
+        self._dispatcher = threading.Thread(
+            target=self._drain_events,
+            daemon=True,
+            name="Workflow-Events"
+        )
+        self._dispatcher.start()
         
         # Load built-in workflows
         self._load_builtin_workflows()
     
+    def _drain_events(self):
+        """Emit queued workflow events on the event bus, in order."""
+        while True:
+            try:
+                event = self._event_queue.get()
+                if event is None:  # Shutdown signal
+                    break
+                self.event_bus.emit(*event)
+            except Exception as e:
+                self.logger.error(f"Workflow event dispatch error: {e}")
+    
+    def _emit(self, event_name: str, *args):
+        """Queue a workflow event for the dispatcher thread."""
+        self._event_queue.put((event_name, *args))
+    
+    def shutdown(self):
+        """
+        Finish in-flight runs, flush their events and stop the worker threads.
+        
+        The step pool is drained first so every event its steps emit is
+        queued before the dispatcher receives its shutdown signal.
+        """
+        self._closed = True
+        self._pool.shutdown()
+        self._event_queue.put(None)
+        self._dispatcher.join(timeout=2.0)
+        self.logger.info("WorkflowEngine shutdown complete")
+    
     def _load_builtin_workflows(self):
         """Load built-in workflow definitions."""
         
@@ -316,9 +822,65 @@ class WorkflowEngine:
     
     def register_workflow(self, workflow: WorkflowDefinition):
         """Register a workflow definition."""
+        errors = workflow.validate()
+        if errors:
+            raise ValueError(f"Invalid workflow {workflow.id}: {'; '.join(errors)}")
+        
+        for step in workflow.steps:
+            if step.condition:
+                # Validate now and warm _COND_CACHE for the first run
+                try:
+                    _compile_condition(step.condition)
+                except Exception as e:
+                    self.logger.warning(
+                        f"Workflow {workflow.id}: invalid condition on step {step.id}: {e}"
+                    )
+        
         self._workflows[workflow.id] = workflow
         self.logger.info(f"Registered workflow: {workflow.id}")
     
+    def load_workflow_file(self, path) -> WorkflowDefinition:
+        """
+        Load and register a workflow from a YAML file.
+        
+        Parsed definitions are pickled next to the config file, keyed by
+        the SHA-256 of the YAML bytes and the workflow schema tag, so
+        unchanged files skip YAML parsing on later loads.
+        
+        Args:
+            path: Path to the YAML workflow file
+            
+        Returns:
+            The registered WorkflowDefinition
+        """
+        content = Path(path).read_bytes()
+        cache_dir = Path(self.config.config_file).parent / "cache" / "workflows"
+        digest = hashlib.sha256(content).hexdigest()
+        cache_file = cache_dir / f"{digest}-{_WORKFLOW_CACHE_SCHEMA}.pkl"
+        
+        workflow = None
+        if cache_file.exists():
+            try:
+                with open(cache_file, 'rb') as f:
+                    workflow = pickle.load(f)
+            except Exception as e:
+                self.logger.warning(f"Ignoring unreadable workflow cache {cache_file}: {e}")
+            if workflow is not None and not _is_complete_workflow(workflow):
+                self.logger.warning(f"Ignoring stale workflow cache {cache_file}")
+                workflow = None
+        
+        if workflow is None:
+            workflow = WorkflowDefinition.from_yaml(content)
+            try:
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                with open(cache_file, 'wb') as f:
+                    pickle.dump(workflow, f, protocol=pickle.HIGHEST_PROTOCOL)
+            except OSError as e:
+                self.logger.warning(f"Failed to cache workflow {path}: {e}")
+        
+        self.register_workflow(workflow)
+        return workflow
+    
     def get_workflow(self, workflow_id: str) -> Optional[WorkflowDefinition]:
         """Get a workflow by ID."""
         return self._workflows.get(workflow_id)
@@ -329,7 +891,7 @@ class WorkflowEngine:
     
     def run_workflow(self, workflow_id: str, variables: Dict = None) -> WorkflowRun:
         """
-        Execute a workflow.
+        Execute a workflow and wait for it to finish.
         
         Args:
             workflow_id: ID of workflow to run
@@ -338,8 +900,26 @@ class WorkflowEngine:
         Returns:
             WorkflowRun instance
         """
+        run = self.submit_workflow(workflow_id, variables)
+        run.wait()
+        return run
+    
+    def submit_workflow(self, workflow_id: str, variables: Dict = None) -> WorkflowRun:
+        """
+        Start a workflow without waiting for it.
+        
+        Args:
+            workflow_id: ID of workflow to run
+            variables: Override workflow variables
+            
+        Returns:
+            WorkflowRun instance; use its wait() to block until done
+        """
         import uuid
         
+        if self._closed:
+            raise RuntimeError("WorkflowEngine is shut down")
+        
         workflow = self.get_workflow(workflow_id)
         if not workflow:
             raise ValueError(f"Unknown workflow: {workflow_id}")
@@ -349,147 +929,259 @@ class WorkflowEngine:
         
         # Apply variable overrides
         if variables:
-            run.variables.update(variables)
+            run.set_variables(variables)
         
-        self._runs[run_id] = run
+        history_max = self.config.get("workflow.run_history_max", 1000)
+        with self._runs_lock:
+            self._runs[run_id] = run
+            while len(self._runs) > history_max:
+                self._runs.popitem(last=False)
         
         self.logger.info(f"Starting workflow run: {workflow_id} ({run_id})")
-        self.event_bus.emit("workflow_started", workflow_id, run_id)
+        self._emit("workflow_started", workflow_id, run_id)
         
         run.status = "running"
-        run.started_at = datetime.now()
+        run.started_at = time.perf_counter_ns()
         
         # Execute workflow
-        self._execute_run(run)
+        if not self._schedule_ready(run):
+            self._finish_run(run)
         
         return run
     
-    def _execute_run(self, run: WorkflowRun):
-        """Execute a workflow run."""
-        while not run.is_complete():
-            ready_steps = run.get_ready_steps()
-            
-            if not ready_steps:
-                # Deadlock or all remaining steps have failed dependencies
-                for step in run.workflow.steps:
-                    if step.status == StepStatus.PENDING:
-                        step.status = StepStatus.SKIPPED
-                break
-            
-            # Execute ready steps (could be parallelized)
-            for step in ready_steps:
-                self._execute_step(run, step)
+    def _schedule_ready(self, run: WorkflowRun) -> int:
+        """
+        Submit every step whose dependencies have succeeded.
+        
+        Returns:
+            Number of steps submitted
+        """
+        ready_steps = run.get_ready_steps()
+        with run.lock:
+            run._outstanding += len(ready_steps)
+        for step in ready_steps:
+            self._pool.submit(self._run_step_task, run, step)
+        return len(ready_steps)
+    
+    def _run_step_task(self, run: WorkflowRun, step: WorkflowStep):
+        """Pool task: run one step, then schedule the successors it unblocked."""
+        try:
+            self._execute_step(run, step)
+        finally:
+            # Successors are scheduled before this step is counted as done,
+            # so the outstanding count only reaches zero once nothing is left
+            self._schedule_ready(run)
+            with run.lock:
+                run._outstanding -= 1
+                finished = run._outstanding == 0
+            if finished:
+                self._finish_run(run)
+    
+    def _finish_run(self, run: WorkflowRun):
+        """Complete a run once no step is queued or running."""
+        # Remaining steps have failed or skipped dependencies
+        with run.lock:
+            for state in run.step_state.values():
+                if state.status == StepStatus.PENDING:
+                    run._set_status(state, StepStatus.SKIPPED)
         
         run.status = "success" if run.is_success() else "failed"
-        run.completed_at = datetime.now()
+        run.completed_at = time.perf_counter_ns()
         
         self.logger.info(f"Workflow completed: {run.workflow.id} ({run.run_id}) - {run.status}")
-        self.event_bus.emit("workflow_completed", run.workflow.id, run.run_id, run.status)
+        self._emit("workflow_completed", run.workflow.id, run.run_id, run.status)
         
         # Execute hooks
-        if run.status == "success" and run.workflow.on_success:
-            self.engine.execute(run.workflow.on_success, {})
-        elif run.status == "failed" and run.workflow.on_failure:
-            self.engine.execute(run.workflow.on_failure, {})
+        try:
+            if run.status == "success" and run.workflow.on_success:
+                self.engine.execute(run.workflow.on_success, {})
+            elif run.status == "failed" and run.workflow.on_failure:
+                self.engine.execute(run.workflow.on_failure, {})
+        finally:
+            run._done.set()
     
     def _execute_step(self, run: WorkflowRun, step: WorkflowStep):
         """Execute a single workflow step."""
         self.logger.info(f"Executing step: {step.id} ({step.name})")
+        state = run.step_state[step.id]
         
-        step.status = StepStatus.RUNNING
-        step.started_at = datetime.now()
+        with run.lock:
+            run._set_status(state, StepStatus.RUNNING)
+            state.started_at = time.perf_counter_ns()
         
-        self.event_bus.emit("workflow_step_started", run.run_id, step.id)
+        self._emit("workflow_step_started", run.run_id, step.id)
         
         # Check condition
         if step.condition:
-            if not self._evaluate_condition(step.condition, run):
-                step.status = StepStatus.SKIPPED
-                step.completed_at = datetime.now()
+            if not self._evaluate_condition(step, run):
+                with run.lock:
+                    run._set_status(state, StepStatus.SKIPPED)
+                    state.completed_at = time.perf_counter_ns()
                 return
         
         # Interpolate parameters
-        params = self._interpolate_params(step.params, run)
+        with run.lock:
+            params = self._interpolate_params(step.params, run)
+        
+        # Reuse the result of an identical cacheable step
+        if step.cacheable:
+            state.cache_key = self._step_cache_key(step.command, params)
+            entry = self._get_cached_step(state.cache_key)
+            if entry is not None:
+                self.logger.debug(f"Step cache hit: {step.id}")
+                self._record_success(run, step.id, entry[1])
         
         # Execute with retry
         attempts = 0
-        max_attempts = step.retry_count + 1
+        max_attempts = 0 if state.status == StepStatus.SUCCESS else step.retry_count + 1
         
         while attempts < max_attempts:
             try:
                 result = self.engine.execute(step.command, params, async_exec=False)
                 
                 if result.get('status') == 'completed':
-                    step.status = StepStatus.SUCCESS
-                    step.result = result.get('result')
-                    run.step_results[step.id] = step.result
+                    self._record_success(run, step.id, result.get('result'))
+                    if step.cacheable:
+                        self._store_cached_step(state.cache_key, state.result)
                     break
                 else:
-                    step.error = result.get('error', 'Unknown error')
-                    attempts += 1
+                    state.error = result.get('error', 'Unknown error')
+                    retriable = self._is_retriable(step, None, state.error)
                     
             except Exception as e:
-                step.error = str(e)
-                attempts += 1
-        
-        if step.status != StepStatus.SUCCESS:
-            step.status = StepStatus.FAILED
+                state.error = str(e)
+                retriable = self._is_retriable(step, type(e).__name__, state.error)
+            
+            attempts += 1
+            if not retriable:
+                break
+            if attempts < max_attempts and step.retry_backoff > 0:
+                # Exponential backoff with jitter, capped by the step timeout
+                delay = step.retry_backoff * 2 ** (attempts - 1)
+                delay += random.uniform(0, step.retry_backoff)
+                time.sleep(min(step.timeout, delay))
         
-        step.completed_at = datetime.now()
+        with run.lock:
+            if state.status != StepStatus.SUCCESS:
+                run._set_status(state, StepStatus.FAILED)
+            state.completed_at = time.perf_counter_ns()
         
-        self.event_bus.emit(
+        self._emit(
             "workflow_step_completed",
             run.run_id,
             step.id,
-            step.status.value
+            state.status.value
         )
     
+    @staticmethod
+    def _is_retriable(step: WorkflowStep, error_type: Optional[str], error: str) -> bool:
+        """
+        Check whether a failed attempt should be retried.
+        
+        Steps without retry_on retry every failure. Otherwise an entry must
+        name the exception type or appear in the error message.
+        """
+        if step.retry_on is None:
+            return True
+        return any(token == error_type or token in str(error) for token in step.retry_on)
+    
+    def _record_success(self, run: WorkflowRun, step_id: str, result: Any):
+        """Store a step's result and release its successors."""
+        state = run.step_state[step_id]
+        with run.lock:
+            run._set_status(state, StepStatus.SUCCESS)
+            state.result = result
+            run.step_results[step_id] = result
+            run.mark_success(step_id)
+    
+    @staticmethod
+    def _step_cache_key(command: str, params: Dict) -> str:
+        """Hash a command and its interpolated parameters."""
+        payload = json.dumps([command, params], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def _get_cached_step(self, key: str) -> Optional[tuple]:
+        """Return a live (expires_at, result) entry, dropping it if expired."""
+        with self._step_cache_lock:
+            entry = self._step_cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._step_cache[key]
+                return None
+            self._step_cache.move_to_end(key)
+            return entry
+    
+    def _store_cached_step(self, key: str, result: Any):
+        """Cache a step result, evicting the least recently used beyond the cap."""
+        ttl = self.config.get("workflow.cache_ttl", 3600)
+        if ttl <= 0:
+            return
+        cache_max = self.config.get("workflow.step_cache_max", 256)
+        with self._step_cache_lock:
+            self._step_cache[key] = (time.monotonic() + ttl, result)
+            self._step_cache.move_to_end(key)
+            while len(self._step_cache) > cache_max:
+                self._step_cache.popitem(last=False)
+    
+    def clear_step_cache(self):
+        """Forget all cached step results."""
+        with self._step_cache_lock:
+            self._step_cache.clear()
+    
     def _interpolate_params(self, params: Dict, run: WorkflowRun) -> Dict:
-        """Interpolate variables in parameters."""
-        result = {}
+        """
+        Interpolate variables in parameters.
+        
+        Returns params itself when no string value holds a placeholder.
+        """
+        result = None
         
         for key, value in params.items():
-            if isinstance(value, str):
-                # Replace ${var} with variable values
-                for var_name, var_value in run.variables.items():
-                    value = value.replace(f"${{{var_name}}}", str(var_value))
-                
-                # Replace ${steps.step_id.result} with step results
-                for step_id, step_result in run.step_results.items():
-                    value = value.replace(
-                        f"${{steps.{step_id}.result}}",
-                        str(step_result)
-                    )
-            
-            result[key] = value
+            if isinstance(value, str) and "${" in value:
+                if result is None:
+                    result = dict(params)
+                # Replace ${var} and ${steps.step_id.result} placeholders
+                result[key] = _INTERP_RE.sub(run.resolve_placeholder, value)
         
-        return result
+        return params if result is None else result
     
-    def _evaluate_condition(self, condition: str, run: WorkflowRun) -> bool:
+    def _evaluate_condition(self, step: WorkflowStep, run: WorkflowRun) -> bool:
         """Evaluate a step condition."""
-        # Simple condition evaluation
-        # Supports: ${var} == "value", ${steps.id.status} == "success"
+        # Supports: ${var} == "value", ${steps.id.result} == "value",
+        # comparisons, and/or/not, literals
         
         try:
-            # Replace variables
-            for var_name, var_value in run.variables.items():
-                condition = condition.replace(f"${{{var_name}}}", f'"{var_value}"')
+            code, names = _compile_condition(step.condition)
             
-            # This is a simplified evaluator - in production, use a proper expression parser
-            return eval(condition)
+            # Values are compared as strings, as they were when quoted inline
+            values = {
+                local: str(
+                    run.step_results[step_id] if step_id is not None
+                    else run.variables[var_name]
+                )
+                for local, (step_id, var_name) in names.items()
+            }
+            return bool(eval(code, {"__builtins__": {}}, values))
         except Exception as e:
             self.logger.warning(f"Condition evaluation failed: {e}")
             return True  # Default to executing
     
     def get_run(self, run_id: str) -> Optional[WorkflowRun]:
         """Get a workflow run by ID."""
-        return self._runs.get(run_id)
+        with self._runs_lock:
+            return self._runs.get(run_id)
     
     def get_run_history(self, workflow_id: str = None, limit: int = 20) -> List[WorkflowRun]:
-        """Get workflow run history."""
-        runs = list(self._runs.values())
+        """Get workflow run history, newest first."""
+        history = []
         
-        if workflow_id:
-            runs = [r for r in runs if r.workflow.id == workflow_id]
+        # Runs are stored in start order, so walk backwards until full
+        with self._runs_lock:
+            for run in reversed(self._runs.values()):
+                if len(history) >= limit:
+                    break
+                if not workflow_id or run.workflow.id == workflow_id:
+                    history.append(run)
         
-        return sorted(runs, key=lambda r: r.started_at or datetime.min, reverse=True)[:limit]
+        return history